@@ -3,9 +3,19 @@
 Check the maximum available words in wordfreq for each language.
 """
 
-from wordfreq import top_n_list, available_languages
+from wordfreq import available_languages
+from wordfreq_cache import cached_top_n_list
 import sys
 
+# Maximum words available per language, as measured by check_language_limits()
+# (wordfreq 3.1). The exporters use these instead of probing top_n_list() with
+# ever larger sizes; re-run this script after upgrading wordfreq.
+KNOWN_MAX_WORDS = {
+    'en': 319938,
+    'es': 341461,
+    'pt': 267444
+}
+
 def check_language_limits():
     """Check how many words are available for each language."""
     languages = {
@@ -20,26 +30,29 @@ def check_language_limits():
     for lang_name, lang_code in languages.items():
         print(f"\n{lang_name} ({lang_code}):")
         
-        # Try different sizes to find the limit
+        # Try different sizes to find the limit. Smaller lists are prefixes
+        # of larger ones, so fetch the largest size once and reuse it.
         test_sizes = [10000, 25000, 50000, 100000, 200000, 500000, 1000000]
-        max_available = 0
+        
+        try:
+            max_available = len(cached_top_n_list(lang_code, test_sizes[-1]))
+        except Exception as e:
+            print(f"  {test_sizes[-1]:,} -> Error: {e}")
+            max_available = 0
         
         for size in test_sizes:
-            try:
-                words = top_n_list(lang_code, size)
-                actual_count = len(words)
-                max_available = actual_count
-                print(f"  {size:,} requested -> {actual_count:,} available")
-                
-                # If we got fewer words than requested, we've hit the limit
-                if actual_count < size:
-                    break
-                    
-            except Exception as e:
-                print(f"  {size:,} -> Error: {e}")
+            actual_count = min(size, max_available)
+            print(f"  {size:,} requested -> {actual_count:,} available")
+            
+            # If we got fewer words than requested, we've hit the limit
+            if actual_count < size:
                 break
         
         print(f"  📊 Maximum available: {max_available:,} words")
+        
+        known_max = KNOWN_MAX_WORDS.get(lang_code)
+        if known_max != max_available:
+            print(f"  ⚠️ KNOWN_MAX_WORDS['{lang_code}'] is {known_max}, update it to {max_available}")
     
     print("\n" + "=" * 50)
     print("All available languages in wordfreq:")
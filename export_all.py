@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Export both the flat and the tiered wordfreq JSON files in one run.
+Each language's word list and frequency table are loaded once and shared
+by both exporters instead of being rebuilt by each script.
+"""
+
+from wordfreq import get_frequency_dict
+from check_wordfreq_limits import KNOWN_MAX_WORDS
+from wordfreq_cache import cached_top_n_list
+from export_wordfreq import export_language_frequencies
+from export_wordfreq_tiered import export_tiered_language_data
+import argparse
+import functools
+import multiprocessing
+
+def export_language(language_name, language_code, compress=False):
+    """Export flat and tiered frequency data for a language from a single wordfreq load."""
+    words = cached_top_n_list(language_code, KNOWN_MAX_WORDS[language_code])
+    freq_dict = get_frequency_dict(language_code)
+    
+    flat_words, _, _ = export_language_frequencies(language_name, language_code, compress=compress, words=words, freq_dict=freq_dict)
+    tiered_words, _ = export_tiered_language_data(language_name, language_code, compress=compress, words=words, freq_dict=freq_dict)
+    return flat_words, tiered_words
+
+def main():
+    """Export flat and tiered frequency data for all supported languages."""
+    parser = argparse.ArgumentParser(description="Export flat and tiered wordfreq JSON files in one pass.")
+    parser.add_argument('--gzip', action='store_true', help="write gzip-compressed .json.gz data files")
+    args = parser.parse_args()
+    
+    print("Starting combined wordfreq data export...")
+    print("=" * 60)
+    
+    languages = {
+        'English': 'en',
+        'Spanish': 'es', 
+        'Portuguese': 'pt'
+    }
+    
+    # Languages are independent, so export them in parallel
+    with multiprocessing.Pool(len(languages)) as pool:
+        export = functools.partial(export_language, compress=args.gzip)
+        results = pool.starmap(export, languages.items())
+    
+    print()
+    print("=" * 60)
+    print(f"Export complete!")
+    print(f"  Flat export: {sum(flat for flat, _ in results):,} words -> public/")
+    print(f"  Tiered export: {sum(tiered for _, tiered in results):,} words -> public/wordfreq-tiers/")
+
+if __name__ == '__main__':
+    main()
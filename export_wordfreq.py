@@ -4,83 +4,87 @@ Export wordfreq data to JSON files for use in the frontend.
 This creates frequency data for the top words in each language.
 """
 
-from wordfreq import word_frequency, top_n_list
-import json
+from wordfreq import get_frequency_dict
+from check_wordfreq_limits import KNOWN_MAX_WORDS
+from wordfreq_cache import cached_top_n_list
+from wordfreq_output import ExportFile
+import argparse
+import functools
+import multiprocessing
 import os
 
-def convert_frequency_to_scale(freq):
-    """Convert wordfreq frequency (0-1) to our 1-5 scale."""
-    if freq == 0:
-        return 1
-    elif freq < 1e-6:
-        return 1  # Very rare
-    elif freq < 1e-5:
-        return 2  # Uncommon
-    elif freq < 1e-4:
-        return 3  # Neutral
-    elif freq < 1e-3:
-        return 4  # Common
-    else:
-        return 5  # Very common/basic
+import numpy as np
+import orjson
 
-def export_language_frequencies(language_name, language_code, num_words=None):
-    """Export frequency data for a specific language."""
+# Upper bounds (exclusive) of each band on the 1-5 scale
+SCALE_THRESHOLDS = np.array([
+    1e-6,  # below: very rare
+    1e-5,  # below: uncommon
+    1e-4,  # below: neutral
+    1e-3,  # below: common
+])
+SCALE_VALUES = np.array([1, 2, 3, 4, 5], dtype=np.int8)  # 5 = very common/basic
+
+def convert_frequencies_to_scale(freqs):
+    """Convert an array of wordfreq frequencies (0-1) to our 1-5 scale."""
+    return SCALE_VALUES[np.searchsorted(SCALE_THRESHOLDS, freqs, side='right')]
+
+def export_language_frequencies(language_name, language_code, num_words=None, compress=False, words=None, freq_dict=None):
+    """Export frequency data for a specific language, gzip-compressed if compress is set.
+    
+    words and freq_dict may be passed in to reuse an already loaded word list
+    and frequency table (see export_all.py); otherwise they are loaded here.
+    """
     print(f"Exporting {language_name} ({language_code}) frequencies...")
     
     try:
-        # Get maximum available words for this language if num_words not specified
-        if num_words is None:
-            # Find maximum available by trying progressively larger numbers
-            test_sizes = [100000, 200000, 300000, 400000, 500000]
-            max_words = 50000  # Fallback minimum
-            
-            for size in test_sizes:
-                try:
-                    test_words = top_n_list(language_code, size)
-                    if len(test_words) < size:
-                        max_words = len(test_words)
-                        break
-                    max_words = len(test_words)
-                except:
-                    break
-            
-            print(f"  Auto-detected maximum: {max_words:,} words")
-            words = top_n_list(language_code, max_words)
-        else:
-            # Use specified number
-            words = top_n_list(language_code, num_words)
+        if words is None:
+            # Use the known maximum for this language if num_words not specified
+            if num_words is None:
+                max_words = KNOWN_MAX_WORDS[language_code]
+                print(f"  Known maximum: {max_words:,} words")
+                words = cached_top_n_list(language_code, max_words)
+            else:
+                # Use specified number
+                words = cached_top_n_list(language_code, num_words)
             
         print(f"  Found {len(words):,} words")
         
-        freq_data = {}
-        
-        for i, word in enumerate(words):
-            if i % 5000 == 0:
-                print(f"  Processing word {i+1:,}/{len(words):,} ({(i+1)/len(words)*100:.1f}%)")
-            
-            freq = word_frequency(word, language_code)
-            scaled_freq = convert_frequency_to_scale(freq)
-            freq_data[word] = scaled_freq
+        # Pull the whole frequency table once instead of dispatching
+        # through word_frequency() for every word
+        if freq_dict is None:
+            freq_dict = get_frequency_dict(language_code)
+        freqs = np.fromiter((freq_dict.get(word, 0.0) for word in words), dtype=np.float64, count=len(words))
+        scaled_freqs = convert_frequencies_to_scale(freqs)  # int8, one byte per word
         
         # Create public directory if it doesn't exist
         os.makedirs('public', exist_ok=True)
         
-        # Write to JSON file
-        filename = f'public/wordfreq-{language_name.lower()}.json'
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(freq_data, f, ensure_ascii=False, indent=2)
+        # Write to JSON file as parallel arrays: scales[i] is the 1-5 scale of words[i].
+        # orjson encodes the int8 array directly, without boxing each value.
+        freq_data = {
+            'words': words,
+            'scales': scaled_freqs
+        }
+        with ExportFile(f'public/wordfreq-{language_name.lower()}.json', compress) as f:
+            f.write(orjson.dumps(freq_data, option=orjson.OPT_SERIALIZE_NUMPY))  # Compact format
         
-        # Calculate file size
-        file_size_mb = os.path.getsize(filename) / 1024 / 1024
-        print(f"  Exported {len(freq_data):,} words to {filename} ({file_size_mb:.1f} MB)")
-        return len(freq_data)
+        # File size is tracked while writing rather than re-statting
+        filename = f.filename
+        file_size_mb = f.size / 1024 / 1024
+        print(f"  Exported {len(words):,} words to {filename} ({file_size_mb:.1f} MB)")
+        return len(words), filename, file_size_mb
         
     except Exception as e:
         print(f"  Error exporting {language_name}: {e}")
-        return 0
+        return 0, None, 0
 
 def main():
     """Export frequency data for all supported languages."""
+    parser = argparse.ArgumentParser(description="Export wordfreq data to JSON files for the frontend.")
+    parser.add_argument('--gzip', action='store_true', help="write gzip-compressed .json.gz files")
+    args = parser.parse_args()
+    
     print("Starting wordfreq data export...")
     
     languages = {
@@ -89,20 +93,18 @@ def main():
         'Portuguese': 'pt'
     }
     
-    total_words = 0
-    
-    for lang_name, lang_code in languages.items():
-        word_count = export_language_frequencies(lang_name, lang_code)
-        total_words += word_count
-        print()
+    # Languages are independent, so export them in parallel
+    with multiprocessing.Pool(len(languages)) as pool:
+        export = functools.partial(export_language_frequencies, compress=args.gzip)
+        results = pool.starmap(export, languages.items())
+    total_words = sum(word_count for word_count, _, _ in results)
+    print()
     
     print(f"Export complete! Total words exported: {total_words:,}")
     print("\nFiles created in the 'public/' directory:")
     total_size = 0
-    for lang_name in languages.keys():
-        filename = f"public/wordfreq-{lang_name.lower()}.json"
-        if os.path.exists(filename):
-            size = os.path.getsize(filename) / 1024 / 1024  # MB
+    for word_count, filename, size in results:
+        if word_count:
             total_size += size
             print(f"  {filename} ({size:.1f} MB)")
     print(f"\nTotal dictionary size: {total_size:.1f} MB")
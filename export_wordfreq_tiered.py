@@ -5,83 +5,111 @@ Creates three tiers per language: core (15k), extended (next 50k), complete (rem
 Uses 1-10 decimal scale internally for more accuracy.
 """
 
-from wordfreq import word_frequency, top_n_list
-import json
+from wordfreq import get_frequency_dict
+from check_wordfreq_limits import KNOWN_MAX_WORDS
+from wordfreq_cache import cached_top_n_list
+from wordfreq_output import ExportFile
+import argparse
+import functools
+import multiprocessing
 import os
+import time
 
-def convert_frequency_to_detailed_scale(freq):
-    """Convert wordfreq frequency (0-1) to detailed 1-10 scale with decimals."""
-    if freq == 0:
-        return 1.0
-    elif freq < 1e-7:
-        return 1.0  # Extremely rare
-    elif freq < 5e-7:
-        return 1.5  # Very rare
-    elif freq < 1e-6:
-        return 2.0  # Rare
-    elif freq < 5e-6:
-        return 2.5  # Uncommon
-    elif freq < 1e-5:
-        return 3.0  # Somewhat uncommon
-    elif freq < 5e-5:
-        return 4.0  # Below average
-    elif freq < 1e-4:
-        return 5.0  # Average/neutral
-    elif freq < 5e-4:
-        return 6.0  # Above average
-    elif freq < 1e-3:
-        return 7.0  # Common
-    elif freq < 5e-3:
-        return 8.0  # Very common
-    elif freq < 1e-2:
-        return 9.0  # Extremely common
-    else:
-        return 10.0  # Core vocabulary
+import numpy as np
+import orjson
 
-def convert_to_user_scale_by_rank(rank, total_words):
-    """Convert rank position to user-friendly 1-5 scale based on distribution 5:4:3:2:1 = 1:2:4:8:16."""
-    # Calculate percentile from rank (lower rank = higher percentile)
-    percentile = (total_words - rank + 1) / total_words
-    
+# Number of array items encoded per orjson call when streaming tier files
+STREAM_CHUNK_SIZE = 10000
+
+# Minimum seconds between progress updates while writing
+PROGRESS_INTERVAL = 2.0
+
+# Upper bounds (exclusive) of each band on the detailed 1-10 scale
+DETAILED_SCALE_THRESHOLDS = np.array([
+    0,     # zero frequency
+    1e-7,  # below: extremely rare
+    5e-7,  # below: very rare
+    1e-6,  # below: rare
+    5e-6,  # below: uncommon
+    1e-5,  # below: somewhat uncommon
+    5e-5,  # below: below average
+    1e-4,  # below: average/neutral
+    5e-4,  # below: above average
+    1e-3,  # below: common
+    5e-3,  # below: very common
+    1e-2,  # below: extremely common
+])
+DETAILED_SCALE_VALUES = np.array([1.0, 1.0, 1.5, 2.0, 2.5, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0])  # 10.0 = core vocabulary
+
+def convert_frequencies_to_detailed_scale(freqs):
+    """Convert an array of wordfreq frequencies (0-1) to detailed 1-10 scale with decimals."""
+    return DETAILED_SCALE_VALUES[np.searchsorted(DETAILED_SCALE_THRESHOLDS, freqs, side='right')]
+
+def convert_ranks_to_user_scale(total_words):
+    """Convert rank positions 1..total_words to user-friendly 1-5 scale based on distribution 5:4:3:2:1 = 1:2:4:8:16."""
     # Distribution: 5:4:3:2:1 = 1:2:4:8:16 (out of 32 parts)
     # Frequency 5 (most common): top 3.125% (1/32)
     # Frequency 4: next 6.25% (2/32) - top 9.375%
     # Frequency 3: next 12.5% (4/32) - top 21.875%
     # Frequency 2: next 25% (8/32) - top 46.875%
     # Frequency 1: remaining 53.125% (16/32)
+    #
+    # The bands are fixed, so compute each one's rank cutoff once in integer
+    # arithmetic: a word at 0-based index i is in the top parts/32 when
+    # (total_words - i) / total_words >= 1 - parts/32, i.e. i <= total_words * parts / 32
+    cut5, cut4, cut3, cut2 = (min(total_words * parts // 32 + 1, total_words) for parts in (1, 3, 7, 15))
+    
+    user_freqs = np.empty(total_words, dtype=np.int8)
+    user_freqs[:cut5] = 5      # Very common/basic
+    user_freqs[cut5:cut4] = 4  # Common
+    user_freqs[cut4:cut3] = 3  # Neutral
+    user_freqs[cut3:cut2] = 2  # Uncommon
+    user_freqs[cut2:] = 1      # Rare
+    return user_freqs
+
+class JsonArrayWriter:
+    """Stream a JSON array to a binary file handle, encoding items chunk by chunk."""
+    
+    def __init__(self, f):
+        self.f = f
+        self.empty = True
+    
+    def __enter__(self):
+        self.f.write(b'[')
+        return self
     
-    if percentile >= 0.96875:    # Top 3.125%
-        return 5  # Very common/basic
-    elif percentile >= 0.90625:  # Top 9.375%
-        return 4  # Common
-    elif percentile >= 0.78125:  # Top 21.875%
-        return 3  # Neutral
-    elif percentile >= 0.53125:  # Top 46.875%
-        return 2  # Uncommon
-    else:                        # Bottom 53.125%
-        return 1  # Rare
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.f.write(b']')
+        return False
+    
+    def extend(self, items):
+        """Append a sequence (list, tuple or NumPy array) of items to the array."""
+        if isinstance(items, np.ndarray):
+            items = items.tolist()
+        if not len(items):
+            return
+        
+        # Encode the whole chunk in one call and strip its enclosing brackets
+        if not self.empty:
+            self.f.write(b',')
+        self.f.write(orjson.dumps(items)[1:-1])
+        self.empty = False
 
-def export_tiered_language_data(language_name, language_code):
-    """Export tiered frequency data for a specific language."""
+def export_tiered_language_data(language_name, language_code, compress=False, words=None, freq_dict=None):
+    """Export tiered frequency data for a specific language, gzip-compressing the tiers if compress is set.
+    
+    words and freq_dict may be passed in to reuse an already loaded word list
+    and frequency table (see export_all.py); otherwise they are loaded here.
+    """
     print(f"Exporting tiered data for {language_name} ({language_code})...")
     
     try:
         # Get maximum available words
-        test_sizes = [100000, 200000, 300000, 400000, 500000]
-        max_words = 50000  # Fallback minimum
-        
-        for size in test_sizes:
-            try:
-                test_words = top_n_list(language_code, size)
-                if len(test_words) < size:
-                    max_words = len(test_words)
-                    break
-                max_words = len(test_words)
-            except:
-                break
-        
+        if words is None:
+            words = cached_top_n_list(language_code, KNOWN_MAX_WORDS[language_code])
+        all_words = words
+        max_words = len(all_words)
         print(f"  Total available: {max_words:,} words")
-        all_words = top_n_list(language_code, max_words)
         
         # Define tier boundaries
         tier_boundaries = {
@@ -90,38 +118,29 @@ def export_tiered_language_data(language_name, language_code):
             'complete': max_words  # All remaining words
         }
         
-        # Create tiered data with ranking
-        tiers = {
-            'core': [],
-            'extended': [],
-            'complete': []
+        # Each tier is a contiguous slice of the ranked word list
+        tier_ranges = {
+            'core': (0, min(tier_boundaries['core'], len(all_words))),
+            'extended': (min(tier_boundaries['core'], len(all_words)), min(tier_boundaries['extended'], len(all_words))),
+            'complete': (min(tier_boundaries['extended'], len(all_words)), len(all_words))
         }
         
         print(f"  Processing {len(all_words):,} words into tiers...")
         
-        for i, word in enumerate(all_words):
-            if i % 10000 == 0:
-                print(f"    Progress: {i+1:,}/{len(all_words):,} ({(i+1)/len(all_words)*100:.1f}%)")
-            
-            freq = word_frequency(word, language_code)
-            detailed_freq = convert_frequency_to_detailed_scale(freq)
-            rank = i + 1  # 1-based ranking
-            
-            # Create word entry with frequency and rank
-            word_entry = {
-                'word': word,
-                'frequency': detailed_freq,
-                'rank': rank,
-                'user_frequency': convert_to_user_scale_by_rank(rank, len(all_words))
-            }
-            
-            # Determine which tier this word belongs to
-            if i < tier_boundaries['core']:
-                tiers['core'].append(word_entry)
-            elif i < tier_boundaries['extended']:
-                tiers['extended'].append(word_entry)
-            else:
-                tiers['complete'].append(word_entry)
+        # Pull the whole frequency table once instead of dispatching
+        # through word_frequency() for every word
+        if freq_dict is None:
+            freq_dict = get_frequency_dict(language_code)
+        freqs = np.fromiter((freq_dict.get(word, 0.0) for word in all_words), dtype=np.float64, count=len(all_words))
+        
+        # Words are exported column-wise (parallel arrays) so the key names
+        # aren't repeated per word. Ranks are sequential, so they are left
+        # out and recovered from rank_range[0] + index on load.
+        columns = {
+            'word': all_words,
+            'frequency': convert_frequencies_to_detailed_scale(freqs),
+            'user_frequency': convert_ranks_to_user_scale(len(all_words))
+        }
         
         # Create public directory if it doesn't exist
         os.makedirs('public/wordfreq-tiers', exist_ok=True)
@@ -129,42 +148,56 @@ def export_tiered_language_data(language_name, language_code):
         # Export each tier
         total_size = 0
         tier_info = {}
+        file_sizes = {}  # filename -> size in MB, tracked while writing
+        
+        # Progress is time-gated rather than printed every N words
+        total_items = len(all_words) * len(columns)
+        items_written = 0
+        last_progress = time.monotonic()
         
-        for tier_name, tier_data in tiers.items():
-            if not tier_data:  # Skip empty tiers
+        for tier_name, (start, end) in tier_ranges.items():
+            if start >= end:  # Skip empty tiers
                 continue
                 
-            filename = f'public/wordfreq-tiers/{language_name.lower()}-{tier_name}.json'
-            
-            # Create both formats: array with ranking info and lookup object
-            tier_export = {
-                'words': tier_data,  # Array of word objects with rank/frequency
-                'lookup': {entry['word']: {
-                    'frequency': entry['frequency'],
-                    'rank': entry['rank'],
-                    'user_frequency': entry['user_frequency']
-                } for entry in tier_data},  # Fast lookup object
-                'tier_info': {
-                    'name': tier_name,
-                    'word_count': len(tier_data),
-                    'rank_range': [tier_data[0]['rank'], tier_data[-1]['rank']] if tier_data else [0, 0]
-                }
+            tier_export_info = {
+                'name': tier_name,
+                'word_count': end - start,
+                'rank_range': [start + 1, end]  # 1-based ranking
             }
             
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(tier_export, f, ensure_ascii=False, separators=(',', ':'))  # Compact format
+            # Stream each column straight from the word list and scale arrays
+            # rather than building the whole document in memory first
+            with ExportFile(f'public/wordfreq-tiers/{language_name.lower()}-{tier_name}.json', compress) as f:
+                f.write(b'{"words":{')
+                for column_index, (column_name, column) in enumerate(columns.items()):
+                    if column_index:
+                        f.write(b',')
+                    f.write(orjson.dumps(column_name) + b':')
+                    with JsonArrayWriter(f) as writer:
+                        for chunk_start in range(start, end, STREAM_CHUNK_SIZE):
+                            chunk_end = min(chunk_start + STREAM_CHUNK_SIZE, end)
+                            writer.extend(column[chunk_start:chunk_end])
+                            
+                            items_written += chunk_end - chunk_start
+                            if time.monotonic() - last_progress >= PROGRESS_INTERVAL:
+                                print(f"    {language_name} progress: {items_written / total_items * 100:.1f}% ({tier_name} tier, {column_name})")
+                                last_progress = time.monotonic()
+                f.write(b'},"tier_info":' + orjson.dumps(tier_export_info) + b'}')  # Compact format
             
-            file_size_mb = os.path.getsize(filename) / 1024 / 1024
+            # Size is however much was written; no need to re-stat the file
+            filename = f.filename
+            file_size_mb = f.size / 1024 / 1024
             total_size += file_size_mb
+            file_sizes[filename] = file_size_mb
             tier_info[tier_name] = {
-                'words': len(tier_data),
+                'words': end - start,
                 'size_mb': file_size_mb,
                 'filename': filename,
-                'rank_range': tier_export['tier_info']['rank_range']
+                'rank_range': tier_export_info['rank_range']
             }
             
-            print(f"    {tier_name.upper()}: {len(tier_data):,} words -> {filename} ({file_size_mb:.1f} MB)")
-            print(f"      Rank range: {tier_export['tier_info']['rank_range'][0]:,} - {tier_export['tier_info']['rank_range'][1]:,}")
+            print(f"    {tier_name.upper()}: {end - start:,} words -> {filename} ({file_size_mb:.1f} MB)")
+            print(f"      Rank range: {tier_export_info['rank_range'][0]:,} - {tier_export_info['rank_range'][1]:,}")
         
         # Create metadata file for this language
         metadata = {
@@ -181,18 +214,24 @@ def export_tiered_language_data(language_name, language_code):
         }
         
         metadata_file = f'public/wordfreq-tiers/{language_name.lower()}-metadata.json'
-        with open(metadata_file, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, ensure_ascii=False, indent=2)
+        # Metadata is tiny, so it always stays uncompressed
+        with ExportFile(metadata_file) as f:
+            f.write(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
+        file_sizes[metadata_file] = f.size / 1024 / 1024
         
         print(f"  ✅ {language_name} complete: {len(all_words):,} words, {total_size:.1f} MB total")
-        return len(all_words)
+        return len(all_words), file_sizes
         
     except Exception as e:
         print(f"  ❌ Error exporting {language_name}: {e}")
-        return 0
+        return 0, {}
 
 def main():
     """Export tiered frequency data for all supported languages."""
+    parser = argparse.ArgumentParser(description="Export wordfreq data to tiered JSON files for smart loading.")
+    parser.add_argument('--gzip', action='store_true', help="write gzip-compressed .json.gz tier files")
+    args = parser.parse_args()
+    
     print("Starting tiered wordfreq data export...")
     print("=" * 60)
     
@@ -202,29 +241,31 @@ def main():
         'Portuguese': 'pt'
     }
     
-    total_words = 0
-    
-    for lang_name, lang_code in languages.items():
-        word_count = export_tiered_language_data(lang_name, lang_code)
-        total_words += word_count
-        print()
+    # Languages are independent, so export them in parallel
+    with multiprocessing.Pool(len(languages)) as pool:
+        export = functools.partial(export_tiered_language_data, compress=args.gzip)
+        results = pool.starmap(export, languages.items())
+    total_words = sum(word_count for word_count, _ in results)
+    print()
     
     print("=" * 60)
     print(f"🎉 Tiered export complete!")
     print(f"📊 Total words exported: {total_words:,}")
     print(f"📁 Files created in 'public/wordfreq-tiers/' directory")
     
-    # Show directory contents
-    if os.path.exists('public/wordfreq-tiers'):
-        files = sorted(os.listdir('public/wordfreq-tiers'))
+    # Show the files written, using the sizes recorded during export
+    file_sizes = {}
+    for _, language_file_sizes in results:
+        file_sizes.update(language_file_sizes)
+    
+    if file_sizes:
         total_dir_size = 0
         
         print(f"\n📂 Directory contents:")
-        for file in files:
-            filepath = f'public/wordfreq-tiers/{file}'
-            size_mb = os.path.getsize(filepath) / 1024 / 1024
+        for filepath in sorted(file_sizes, key=os.path.basename):
+            size_mb = file_sizes[filepath]
             total_dir_size += size_mb
-            print(f"  {file} ({size_mb:.1f} MB)")
+            print(f"  {os.path.basename(filepath)} ({size_mb:.1f} MB)")
         
         print(f"\n💾 Total directory size: {total_dir_size:.1f} MB")
 
@@ -58,6 +58,44 @@ function getLanguageCache(language: string): LanguageCache {
   return languageCache.get(langKey)!;
 }
 
+// Resolve the URL of a tier file from the language metadata. The exporters
+// (`export_wordfreq_tiered.py` / `export_all.py`, with or without --gzip)
+// record the file they actually wrote, `.json` or `.json.gz`, in tiers[*].filename.
+async function getTierUrl(langKey: string, tier: 'core' | 'extended' | 'complete'): Promise<string> {
+  const metadata = await loadMetadata(langKey);
+  const filename: string | undefined = metadata?.tiers?.[tier]?.filename;
+  if (filename) {
+    return '/' + filename.replace(/^public\//, '');
+  }
+  return `/wordfreq-tiers/${langKey}-${tier}.json`;
+}
+
+// Fetch a tier file and parse it, decompressing gzip data when needed
+async function fetchTierJson(url: string): Promise<any> {
+  const response = await fetch(url);
+  if (!response.ok) {
+    throw new Error(`Failed to load ${url}: ${response.status}`);
+  }
+  
+  // Check the gzip magic bytes rather than the extension: servers that send
+  // Content-Encoding: gzip have already had the body decoded by fetch
+  const bytes = new Uint8Array(await response.arrayBuffer());
+  let text: string;
+  if (bytes.length >= 2 && bytes[0] === 0x1f && bytes[1] === 0x8b) {
+    const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+    text = await new Response(stream).text();
+  } else {
+    text = new TextDecoder().decode(bytes);
+  }
+  
+  try {
+    return JSON.parse(text);
+  } catch (error) {
+    // e.g. an SPA fallback serving index.html for a missing file
+    throw new Error(`${url} is not a wordfreq tier file (${response.headers.get('Content-Type')})`);
+  }
+}
+
 // Load a specific tier for a language
 async function loadTier(language: string, tier: 'core' | 'extended' | 'complete'): Promise<boolean> {
   const langKey = language.toLowerCase();
@@ -77,30 +115,39 @@ async function loadTier(language: string, tier: 'core' | 'extended' | 'complete'
   try {
     console.log(`📥 Loading ${tier} wordfreq data for ${language}...`);
     
-    const response = await fetch(`/wordfreq-tiers/${langKey}-${tier}.json`);
+    const data = await fetchTierJson(await getTierUrl(langKey, tier));
     
-    if (!response.ok) {
-      throw new Error(`Failed to load ${tier} data: ${response.status}`);
+    if (!wordRankCache.has(langKey)) {
+      wordRankCache.set(langKey, new Map());
     }
+    const rankCache = wordRankCache.get(langKey)!;
     
-    const data = await response.json();
+    const addRankedWord = (word: string, frequency: number, rank: number, userFrequency: number) => {
+      const wordKey = word.toLowerCase();
+      cache[tier].set(wordKey, frequency);
+      rankCache.set(wordKey, { frequency, rank, userFrequency });
+    };
     
-    // Load into the appropriate tier cache from the new ranked format
-    if (data.lookup) {
-      // New format with lookup object
-      if (!wordRankCache.has(langKey)) {
-        wordRankCache.set(langKey, new Map());
+    // Load into the appropriate tier cache from the ranked format
+    if (data.words && Array.isArray(data.words.word)) {
+      // Column-wise format: parallel arrays, ranks run sequentially from the tier's first rank
+      const { word: words, frequency: frequencies, user_frequency: userFrequencies } = data.words as {
+        word: string[]; frequency: number[]; user_frequency: number[]
+      };
+      const firstRank: number = data.tier_info.rank_range[0];
+      for (let i = 0; i < words.length; i++) {
+        addRankedWord(words[i], frequencies[i], firstRank + i, userFrequencies[i]);
+      }
+    } else if (Array.isArray(data.words)) {
+      // Ranked array of word objects; build the lookup in one pass
+      for (const entry of data.words as Array<{ word: string; frequency: number; rank: number; user_frequency: number }>) {
+        addRankedWord(entry.word, entry.frequency, entry.rank, entry.user_frequency);
       }
-      const rankCache = wordRankCache.get(langKey)!;
-      
+    } else if (data.lookup) {
+      // Older ranked format with a precomputed lookup object
       for (const [word, wordData] of Object.entries(data.lookup)) {
         const typedWordData = wordData as { frequency: number; rank: number; user_frequency: number };
-        cache[tier].set(word.toLowerCase(), typedWordData.frequency);
-        rankCache.set(word.toLowerCase(), {
-          frequency: typedWordData.frequency,
-          rank: typedWordData.rank,
-          userFrequency: typedWordData.user_frequency
-        });
+        addRankedWord(word, typedWordData.frequency, typedWordData.rank, typedWordData.user_frequency);
       }
     } else {
       // Fallback for old format
@@ -111,7 +158,7 @@ async function loadTier(language: string, tier: 'core' | 'extended' | 'complete'
     
     cache.loadState[tier] = true;
     
-    console.log(`✅ Loaded ${tier} tier for ${language}: ${Object.keys(data).length} words`);
+    console.log(`✅ Loaded ${tier} tier for ${language}: ${cache[tier].size} words`);
     return true;
     
   } catch (error) {
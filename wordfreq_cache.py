@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Cached access to wordfreq word lists.
+Results are memoized in-process and pickled under ~/.cache/polycast, keyed by
+the installed wordfreq version, so repeated exports skip rebuilding them.
+"""
+
+from wordfreq import top_n_list
+from importlib.metadata import version
+import functools
+import os
+import pickle
+
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'polycast')
+
+@functools.lru_cache(maxsize=None)
+def cached_top_n_list(language_code, n):
+    """Return top_n_list(language_code, n) as a tuple, cached in memory and on disk."""
+    cache_file = os.path.join(CACHE_DIR, f"wordfreq-{version('wordfreq')}-{language_code}-{n}.pkl")
+    
+    try:
+        with open(cache_file, 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        # Not cached yet or unreadable (truncated, written by another Python
+        # with an unsupported protocol, ...), rebuild below
+        pass
+    
+    words = tuple(top_n_list(language_code, n))
+    
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Write to a temp file first so a concurrent reader never sees a partial pickle
+        tmp_file = f'{cache_file}.{os.getpid()}.tmp'
+        with open(tmp_file, 'wb') as f:
+            pickle.dump(words, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        print(f"  Could not cache word list to {cache_file}: {e}")
+    
+    return words
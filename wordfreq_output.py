@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Output file handling shared by the wordfreq export scripts.
+"""
+
+import gzip
+import os
+
+# Output files are written through a 1 MiB buffer so many small writes
+# become a handful of write() syscalls
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Middle-of-the-road gzip level: most of the size win at a fraction of level 9's CPU cost
+GZIP_COMPRESS_LEVEL = 6
+
+class ExportFile:
+    """Binary export file, optionally gzip-compressed, that records its size on disk.
+    
+    With compress=True the data goes to filename + '.gz'. After the file is
+    closed, `filename` is the path actually written and `size` the number of
+    bytes on disk. The other variant (plain or .gz) is removed once the write
+    succeeds, so readers never pick up a stale copy.
+    """
+    
+    def __init__(self, filename, compress=False):
+        self.filename = f'{filename}.gz' if compress else filename
+        self.stale_filename = filename if compress else f'{filename}.gz'
+        self.compress = compress
+        self.size = 0
+    
+    def __enter__(self):
+        self.raw = open(self.filename, 'wb', buffering=WRITE_BUFFER_SIZE)
+        if self.compress:
+            # mtime=0 keeps the output byte-identical across runs
+            self.f = gzip.GzipFile(fileobj=self.raw, mode='wb', compresslevel=GZIP_COMPRESS_LEVEL, mtime=0)
+        else:
+            self.f = self.raw
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.f is not self.raw:
+            self.f.close()  # Flushes the gzip trailer into the raw file
+        self.size = self.raw.tell()
+        self.raw.close()
+        
+        if exc_type is None:
+            try:
+                os.remove(self.stale_filename)
+            except FileNotFoundError:
+                pass
+        return False
+    
+    def write(self, data):
+        return self.f.write(data)